@@ -72,7 +72,7 @@ def test_imports():
         'requests',
         'telegram',
         'dotenv',
-        'pytz'
+        'tzdata'
     ]
     
     failed_imports = []
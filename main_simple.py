@@ -4,35 +4,325 @@ CR7 Token Bot - Production Version with REAL Token Transfers
 Real-time buy alerts with automatic token distribution to buyer wallets
 """
 
-import json
 import asyncio
 import time
 import logging
-import requests
+import logging.handlers
+import queue
+import atexit
 import os
 import signal
 import sys
-from datetime import datetime
+import random
+import sqlite3
+import hashlib
+import math
+import functools
+from dataclasses import dataclass, asdict, field, fields, MISSING
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.error import TelegramError
+from telegram.error import TelegramError, RetryAfter, NetworkError, BadRequest
 from dotenv import load_dotenv
 from aiohttp import web
 import aiohttp
+import orjson
 
 # Configure logging based on environment
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
 environment = os.getenv('ENVIRONMENT', 'production')
 
+# Records are handed to a queue and written to file/console by a background
+# listener thread, so log I/O never blocks the event loop
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler('logs/cr7_bot.log', encoding='utf-8', delay=True),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=getattr(logging, log_level, logging.INFO),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/cr7_bot.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',  # final formatting happens in the listener's handlers
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# Static message fragments, built once at import instead of on every send
+BRAND_HEADER = "🦅 <b>Official $CR7 Coin</b>\n<i>Be DeFiant</i>\n\n"
+
+PRESALE_ENDED_SECTION = "⏰ <b>Presale Status:</b>\n🔴 <b>PRESALE ENDED</b>\n\n"
+
+DAILY_SUMMARY_TEMPLATE = (
+    BRAND_HEADER +
+    "📊 <b>DAILY REAL-TIME SUMMARY</b>\n\n"
+    "🦅🦅🦅🦅🦅\n\n"
+    "🪙 Token: ${token_symbol}\n"
+    "📅 Date: {date}\n\n"
+    "📈 <b>Today's Real-Time Activity:</b>\n"
+    "• Total Buys: {daily_buys}\n"
+    "• Total Volume: {daily_volume:.2f} SOL\n"
+    "• Total Distributed: {daily_distributed:,} tokens\n"
+    "• Total Airdrops: {daily_airdrops}\n"
+    "• Average Buy: {average_buy:.2f} SOL\n"
+    "• Average Distribution: {average_distribution:.0f} tokens\n"
+    "• Airdrop Rate: {airdrop_rate:.1f}%\n\n"
+    "🏆 <b>All-Time Real-Time Stats:</b>\n"
+    "• Total Buys: {total_buys}\n"
+    "• Total Volume: {total_volume:.2f} SOL\n"
+    "• Total Distributed: {total_distributed:,} tokens\n"
+    "• Total Airdrops: {total_airdrops}\n\n"
+)
+
+# Base58 alphabet used by Solana addresses
+B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+B58_INDEX = {char: index for index, char in enumerate(B58_ALPHABET)}
+
+def address_key(address: str) -> bytes:
+    """Decode a base58 wallet address to its raw bytes (32 for a Solana pubkey)"""
+    try:
+        num = 0
+        for char in address:
+            num = num * 58 + B58_INDEX[char]
+    except KeyError:
+        # Not base58 - fall back to the address text itself
+        return address.encode()
+    leading_zeros = len(address) - len(address.lstrip("1"))
+    return b"\x00" * leading_zeros + num.to_bytes((num.bit_length() + 7) // 8, "big")
+
+@dataclass(slots=True)
+class Stats:
+    """Buy/distribution counters, all-time and for the current day"""
+    total_buys: int = 0
+    total_volume: float = 0.0
+    total_distributed: float = 0.0
+    total_airdrops: int = 0
+    daily_buys: int = 0
+    daily_volume: float = 0.0
+    daily_distributed: float = 0.0
+    daily_airdrops: int = 0
+    
+    def record_buy(self, sol_amount: float, tokens_distributed: int, airdrop_sent: bool):
+        """Count one buy (and its airdrop, if any)"""
+        self.total_buys += 1
+        self.total_volume += sol_amount
+        self.total_distributed += tokens_distributed
+        self.daily_buys += 1
+        self.daily_volume += sol_amount
+        self.daily_distributed += tokens_distributed
+        
+        if airdrop_sent:
+            self.total_airdrops += 1
+            self.daily_airdrops += 1
+    
+    def reset_daily(self):
+        """Zero the daily counters"""
+        self.daily_buys = 0
+        self.daily_volume = 0.0
+        self.daily_distributed = 0.0
+        self.daily_airdrops = 0
+
+def parse_private_key_list(value: str) -> list:
+    """Parse a private key byte list from the environment (hex string or comma-separated bytes)"""
+    value = value.strip()
+    if ',' in value:
+        return [int(x.strip()) for x in value.split(',')]
+    return list(bytes.fromhex(value))
+
+# Config keys that may be overridden from the environment, with the type to coerce each to
+ENV_CONFIG_TYPES = {
+    'TELEGRAM_BOT_TOKEN': str,
+    'TELEGRAM_GROUP_ID': str,
+    'SOLANA_RPC': str,
+    'TOKEN_MINT': str,
+    'WALLET_PRIVATE_KEY': parse_private_key_list,
+    'TOKENS_PER_SOL': int,
+    'MINIMUM_BUY_SOL': float,
+    'DISTRIBUTION_RATIO': float,
+    'MIN_DISTRIBUTION': int,
+    'MAX_DISTRIBUTION': int,
+    'AIRDROP_AMOUNT': int,
+    'BUY_BUTTON_LINK': str,
+    'PRESALE_END_DATE': str,
+    'PRESALE_TIMEZONE': str
+}
+
+@dataclass(frozen=True, slots=True)
+class BotConfig:
+    """Validated, immutable bot configuration (fields map to upper-case config keys)"""
+    telegram_bot_token: str
+    telegram_group_id: str
+    solana_rpc: str
+    token_mint: str
+    token_symbol: str = "CR7"
+    wallet_private_key: list = field(default_factory=list)
+    distribution_ratio: float = 1.0
+    min_distribution: int = 1400
+    max_distribution: int = 1000000
+    tokens_per_sol: int = 7000
+    minimum_buy_sol: float = 0.2
+    airdrop_amount: int = 1000
+    allow_one_airdrop_per_user: bool = True
+    buy_button_link: str = "https://raydium.io/swap/"
+    presale_end_date: str = "2025-09-06 23:59:59"
+    presale_timezone: str = "UTC"
+    check_interval: float = 60.0
+    rate_limit_delay: float = 2.0
+    sol_price_ttl: float = 30.0
+    price_circuit_threshold: int = 5
+    price_circuit_cooldown: float = 60.0
+    telegram_queue_size: int = 1000
+    state_db_path: str = "logs/cr7_state.db"
+    state_flush_interval: float = 0.5
+    seen_tx_capacity: int = 65536
+    airdrop_users_capacity: int = 1000000
+    
+    @classmethod
+    def from_dict(cls, config: dict) -> "BotConfig":
+        """Build from the merged config dict, coercing each value to its field type"""
+        values = {}
+        for f in fields(cls):
+            key = f.name.upper()
+            if key not in config:
+                if f.default is MISSING and f.default_factory is MISSING:
+                    raise ValueError(f"Missing required config key {key}")
+                continue
+            
+            value = config[key]
+            if f.type is bool or isinstance(value, bool):
+                valid = f.type is bool and isinstance(value, bool)
+            elif f.type is int:
+                valid = isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+            elif f.type is float:
+                valid = isinstance(value, (int, float))
+            else:
+                valid = isinstance(value, f.type) or (f.type is str and isinstance(value, int))
+            if not valid:
+                raise ValueError(f"Invalid config value for {key}: {value!r}")
+            values[f.name] = f.type(value)
+        return cls(**values)
+
+# Transient HTTP failures are retried this many times in total, with jittered backoff
+RETRY_ATTEMPTS = 3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with jitter for a 0-based retry attempt"""
+    return min(cap, base * 2 ** attempt) * (0.5 + random.random())
+
+class CircuitBreaker:
+    """Short-circuit calls to a failing service for a cooldown after repeated failures"""
+    
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0
+    
+    def allow(self) -> bool:
+        return time.monotonic() >= self._open_until
+    
+    def record_success(self):
+        self._failures = 0
+    
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.threshold:
+            self._open_until = time.monotonic() + self.cooldown
+            self._failures = 0
+
+@functools.lru_cache(maxsize=4096)
+def format_short_address(address: str) -> str:
+    """Shorten an address to ABCD...WXYZ (cached, repeat buyers are common)"""
+    if len(address) > 8:
+        return f"{address[:4]}...{address[-4:]}"
+    return address
+
+class BloomFilter:
+    """Fixed-size Bloom filter for str/bytes keys"""
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key):
+        """Derive bit positions from one blake2b digest (enhanced double hashing)"""
+        if isinstance(key, str):
+            key = key.encode()
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little")
+        return [(h1 + i * h2 + (i * i * i - i) // 6) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, key):
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+    
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+    
+    def __len__(self):
+        return self.count
+
+
+class RotatingBloomFilter:
+    """Two-generation Bloom filter that remembers at least the last `capacity` keys
+    in fixed memory; the older generation is dropped when the active one fills up"""
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.active = BloomFilter(capacity, error_rate)
+        self.previous = BloomFilter(capacity, error_rate)
+    
+    def add(self, key):
+        if self.active.count >= self.capacity:
+            self.previous = self.active
+            self.active = BloomFilter(self.capacity, self.error_rate)
+        self.active.add(key)
+    
+    def __contains__(self, key):
+        return key in self.active or key in self.previous
+    
+    def __len__(self):
+        return self.active.count + self.previous.count
+
+
+class ScalableBloomFilter:
+    """Bloom filter that never forgets: when the newest generation reaches its capacity
+    a twice-as-large one is added with half the error rate, so the combined
+    false-positive rate stays below `error_rate` however many keys are added"""
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.error_rate = error_rate
+        self.generations = [BloomFilter(capacity, error_rate / 2)]
+    
+    def add(self, key):
+        active = self.generations[-1]
+        if active.count >= active.capacity:
+            logger.info(f"Bloom filter reached {len(self)} keys - adding a generation")
+            active = BloomFilter(active.capacity * 2, self.error_rate / 2 ** (len(self.generations) + 1))
+            self.generations.append(active)
+        active.add(key)
+    
+    def __contains__(self, key):
+        return any(key in generation for generation in self.generations)
+    
+    def __len__(self):
+        return sum(generation.count for generation in self.generations)
+
 # Global variables for graceful shutdown
 shutdown_event = asyncio.Event()
 app = None
@@ -43,59 +333,130 @@ class CR7TokenBot:
         # Load environment variables from .env file
         load_dotenv()
         
-        # Load config from JSON file
+        # Load config from JSON file, overridden by environment variables if available,
+        # and validate it once into an immutable BotConfig
         self.config = self.load_config(config_path)
-        
-        # Override sensitive config with environment variables if available
-        self.config = self.load_env_config()
+        self.cfg = cfg = BotConfig.from_dict(self.config)
         
         # Initialize Telegram bot
-        self.telegram_bot = Bot(token=self.config["TELEGRAM_BOT_TOKEN"])
-        self.telegram_group_id = self.config["TELEGRAM_GROUP_ID"]
-        self.token_mint = self.config["TOKEN_MINT"]
-        self.token_symbol = self.config.get("TOKEN_SYMBOL", "CR7")
-        self.rpc_url = self.config["SOLANA_RPC"]
+        self.telegram_bot = Bot(token=cfg.telegram_bot_token)
+        self.telegram_group_id = cfg.telegram_group_id
+        self.token_mint = cfg.token_mint
+        self.token_symbol = cfg.token_symbol
+        self.rpc_url = cfg.solana_rpc
         
         # Token distribution settings
-        self.distribution_ratio = self.config.get("DISTRIBUTION_RATIO", 1.0)
-        self.min_distribution = self.config.get("MIN_DISTRIBUTION", 1400)
-        self.max_distribution = self.config.get("MAX_DISTRIBUTION", 1000000)
-        self.tokens_per_sol = self.config.get("TOKENS_PER_SOL", 7000)
-        self.minimum_buy_sol = self.config.get("MINIMUM_BUY_SOL", 0.2)
-        self.airdrop_amount = self.config.get("AIRDROP_AMOUNT", 1000)
-        self.one_airdrop_per_user = self.config.get("ALLOW_ONE_AIRDROP_PER_USER", True)
-        self.buy_button_link = self.config.get("BUY_BUTTON_LINK", "https://raydium.io/swap/")
+        self.distribution_ratio = cfg.distribution_ratio
+        self.min_distribution = cfg.min_distribution
+        self.max_distribution = cfg.max_distribution
+        self.tokens_per_sol = cfg.tokens_per_sol
+        self.minimum_buy_sol = cfg.minimum_buy_sol
+        self.airdrop_amount = cfg.airdrop_amount
+        self.one_airdrop_per_user = cfg.allow_one_airdrop_per_user
+        self.buy_button_link = cfg.buy_button_link
+        
+        # Static buy alert fragments derived from fixed config, built once
+        self._alert_header = (
+            f"🎉 <b>New <a href='https://solscan.io/token/{self.token_mint}'>${self.token_symbol}</a> Buy</b>\n\n"
+            "🦅🦅🦅🦅🦅\n\n"
+        )
+        self._symbol_suffix = f" {self.token_symbol}\n"
+        self._token_suffix = f" ${self.token_symbol}\n"
+        
+        # The BUY button only depends on fixed config, so every message shares one keyboard
+        self._buy_keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(f"🛒 BUY ${self.token_symbol}", url=self.buy_button_link)]])
+        
+        # Distribution config is fixed for the bot's lifetime, so fold the rate
+        # and ratio into a single multiplier once instead of on every buy
+        self._distribution_rate = self.tokens_per_sol * self.distribution_ratio
         
         # Presale configuration
-        self.presale_end_date = self.config.get("PRESALE_END_DATE", "2025-09-06 23:59:59")
-        self.presale_timezone = self.config.get("PRESALE_TIMEZONE", "UTC")
+        self.presale_end_date = cfg.presale_end_date
+        self.presale_timezone = cfg.presale_timezone
+        self._presale_end = self.parse_presale_end()
+        self._presale_end_ts = self._presale_end.timestamp() if self._presale_end else None
+        self._countdown_cache = (None, 0.0)  # (countdown dict, monotonic time computed)
         
         # Real-time monitoring settings
         self.monitoring_active = True
-        self.check_interval = self.config.get("CHECK_INTERVAL", 60)
-        self.max_transactions_per_check = self.config.get("MAX_TRANSACTIONS_PER_CHECK", 20)
-        self.rate_limit_delay = self.config.get("RATE_LIMIT_DELAY", 2)
+        self.check_interval = cfg.check_interval
+        self.rate_limit_delay = cfg.rate_limit_delay
+        
+        # Error backoff for the monitoring loop (seconds, doubled per consecutive error)
+        self._err_backoff = 1.0
+        
+        # SOL price cache as (price, monotonic fetch time); the lock makes
+        # concurrent refreshes share a single CoinGecko request
+        self.sol_price_ttl = cfg.sol_price_ttl
+        self._sol_price_cache = (0.0, 0.0)
+        self._sol_price_lock = asyncio.Lock()
+        
+        # Stop calling CoinGecko for a while after repeated failed fetches
+        self._price_breaker = CircuitBreaker(
+            cfg.price_circuit_threshold,
+            cfg.price_circuit_cooldown
+        )
+        
+        # Per-chat monotonic time before which no message may be sent (flood control)
+        self._chat_cooldown: dict[str, float] = {}
+        
+        # Outbound Telegram messages are queued and sent by a background worker
+        # so a slow Telegram API never stalls transaction monitoring
+        self._tg_queue = asyncio.Queue(maxsize=cfg.telegram_queue_size)
+        
+        # Shared HTTP session for RPC and price calls (created lazily inside the event loop)
+        self._http = None
         
         # Statistics
-        self.total_buys = 0
-        self.total_volume = 0.0
-        self.total_distributed = 0.0
-        self.total_airdrops = 0
-        self.daily_buys = 0
-        self.daily_volume = 0.0
-        self.daily_distributed = 0.0
-        self.daily_airdrops = 0
+        self.stats = Stats()
         self.last_reset_date = datetime.now().date()
         
-        # Track seen transactions and users
-        self._seen_transactions = set()
-        self._airdrop_users = set() if self.one_airdrop_per_user else None
+        # Track seen transactions and users. SQLite is the source of truth so a
+        # restart doesn't replay old signatures or re-issue airdrops; new entries
+        # are queued and written in batches off the event loop.
+        self.state_db_path = cfg.state_db_path
+        self.state_flush_interval = cfg.state_flush_interval
+        self.seen_tx_capacity = cfg.seen_tx_capacity
+        self.airdrop_users_capacity = cfg.airdrop_users_capacity
+        self._state_db = self.open_state_db(self.state_db_path)
+        self._pending_seen = []
+        self._pending_airdrop_users = []
+        self._db_writes = set()
+        self._db_lock = asyncio.Lock()  # one writer at a time on the shared connection
+        self._state_stop = asyncio.Event()
+        
+        # Telegram file_ids of already-uploaded images, keyed by image URL
+        self._photo_file_ids = dict(self._state_db.execute("SELECT url, file_id FROM photo_file_ids"))
+        
+        # Only the most recent signatures are kept in memory (bounded filter);
+        # older ones never come back as the latest transaction
+        self._seen_transactions = RotatingBloomFilter(self.seen_tx_capacity, 1e-6)
+        for (sig,) in self._state_db.execute(
+            "SELECT sig FROM seen ORDER BY rowid DESC LIMIT ?", (self.seen_tx_capacity,)
+        ):
+            self._seen_transactions.add(sig)
+        
+        # Airdrop recipients are kept as a scalable Bloom filter over raw pubkey bytes
+        # (it grows past AIRDROP_USERS_CAPACITY); a false positive only means a user
+        # misses the free airdrop
+        self._airdrop_users = None
+        if self.one_airdrop_per_user:
+            self._airdrop_users = ScalableBloomFilter(self.airdrop_users_capacity, 1e-4)
+            for (addr,) in self._state_db.execute("SELECT addr FROM airdrop_users"):
+                self._airdrop_users.add(address_key(addr))
         
         # Admin wallet for token transfers
-        self.admin_wallet_private_key = self.config.get("WALLET_PRIVATE_KEY", [])
+        self.admin_wallet_private_key = cfg.wallet_private_key
         self.admin_wallet = None
         self.admin_token_account = None
         
+        # Completed transfers keyed by (incoming signature, kind) so a retry or
+        # restart can never send tokens twice for the same buy
+        self._completed_transfers = {
+            (row[0], row[1]) for row in self._state_db.execute("SELECT signature, kind FROM transfers")
+        }
+        self._transfers_in_flight = set()
+        
         logger.info("CR7 Token Bot initialized successfully for PRODUCTION with REAL TRANSFERS")
         logger.info(f"Token Mint: {self.token_mint}")
         logger.info(f"Token Distribution: 1 SOL = {self.tokens_per_sol} {self.token_symbol} tokens")
@@ -105,153 +466,367 @@ class CR7TokenBot:
         logger.info(f"Monitoring Mode: REAL TRANSACTIONS with REAL TRANSFERS")
     
     def load_config(self, config_path: str):
-        """Load configuration from JSON file"""
+        """Load configuration from JSON file, overriding it with environment variables"""
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = orjson.loads(f.read())
             logger.info("Configuration loaded successfully")
-            return config
         except FileNotFoundError:
             logger.error(f"Configuration file {config_path} not found")
-            # Return default config
-            return {
-                "TELEGRAM_BOT_TOKEN": os.getenv("TELEGRAM_BOT_TOKEN", ""),
-                "TELEGRAM_GROUP_ID": os.getenv("TELEGRAM_GROUP_ID", ""),
-                "SOLANA_RPC": os.getenv("SOLANA_RPC", "https://api.mainnet-beta.solana.com"),
-                "TOKEN_MINT": os.getenv("TOKEN_MINT", ""),
+            # Fall back to default config
+            config = {
+                "TELEGRAM_BOT_TOKEN": "",
+                "TELEGRAM_GROUP_ID": "",
+                "SOLANA_RPC": "https://api.mainnet-beta.solana.com",
+                "TOKEN_MINT": "",
                 "TOKEN_SYMBOL": "CR7"
             }
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in configuration file: {e}")
             raise
-    
-    def load_env_config(self):
-        """Load configuration from environment variables, overriding JSON config"""
-        config = self.config.copy()
         
         # Override sensitive information with environment variables
-        env_mappings = {
-            'TELEGRAM_BOT_TOKEN': 'TELEGRAM_BOT_TOKEN',
-            'TELEGRAM_GROUP_ID': 'TELEGRAM_GROUP_ID',
-            'SOLANA_RPC': 'SOLANA_RPC',
-            'TOKEN_MINT': 'TOKEN_MINT',
-            'WALLET_PRIVATE_KEY': 'WALLET_PRIVATE_KEY',
-            'TOKENS_PER_SOL': 'TOKENS_PER_SOL',
-            'MINIMUM_BUY_SOL': 'MINIMUM_BUY_SOL',
-            'DISTRIBUTION_RATIO': 'DISTRIBUTION_RATIO',
-            'MIN_DISTRIBUTION': 'MIN_DISTRIBUTION',
-            'MAX_DISTRIBUTION': 'MAX_DISTRIBUTION',
-            'AIRDROP_AMOUNT': 'AIRDROP_AMOUNT',
-            'BUY_BUTTON_LINK': 'BUY_BUTTON_LINK',
-            'PRESALE_END_DATE': 'PRESALE_END_DATE',
-            'PRESALE_TIMEZONE': 'PRESALE_TIMEZONE'
-        }
-        
-        for env_key, config_key in env_mappings.items():
+        for env_key, caster in ENV_CONFIG_TYPES.items():
             env_value = os.getenv(env_key)
             if env_value is not None:
-                # Convert string values to appropriate types
-                if env_key in ['TOKENS_PER_SOL', 'MIN_DISTRIBUTION', 'MAX_DISTRIBUTION', 'AIRDROP_AMOUNT']:
-                    config[config_key] = int(env_value)
-                elif env_key in ['MINIMUM_BUY_SOL', 'DISTRIBUTION_RATIO']:
-                    config[config_key] = float(env_value)
-                elif env_key == 'WALLET_PRIVATE_KEY':
-                    # Convert comma-separated string to list of integers
-                    try:
-                        config[config_key] = [int(x.strip()) for x in env_value.split(',')]
-                    except ValueError:
-                        logger.warning(f"Invalid WALLET_PRIVATE_KEY format in environment variables")
-                else:
-                    config[config_key] = env_value
+                try:
+                    config[env_key] = caster(env_value)
+                except ValueError:
+                    logger.warning(f"Invalid {env_key} format in environment variables")
+                    continue
                 logger.info(f"Loaded {env_key} from environment variables")
         
         return config
     
-    async def send_telegram_message(self, message: str, image_url: str = None, inline_keyboard: InlineKeyboardMarkup = None):
-        """Send message to Telegram group with optional image and inline keyboard"""
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=15),
+                headers={"User-Agent": "CR7Bot/1.0"},
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._http
+    
+    async def aclose(self):
+        """Close the shared HTTP session and flush persistent state"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        
+        await self.flush_state()
+        # Writes whose caller was cancelled keep running in their worker thread
+        if self._db_writes:
+            await asyncio.gather(*self._db_writes, return_exceptions=True)
+        self._state_db.close()
+    
+    def open_state_db(self, db_path: str):
+        """Open the SQLite database holding seen transactions, airdrop users, transfers and photo file_ids"""
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        
+        # Writes happen from a worker thread via asyncio.to_thread, one at a time
+        # (see _db_write) so transactions on this connection never interleave
+        con = sqlite3.connect(db_path, check_same_thread=False)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("CREATE TABLE IF NOT EXISTS seen (sig TEXT PRIMARY KEY)")
+        con.execute("CREATE TABLE IF NOT EXISTS airdrop_users (addr TEXT PRIMARY KEY)")
+        con.execute("CREATE TABLE IF NOT EXISTS photo_file_ids (url TEXT PRIMARY KEY, file_id TEXT NOT NULL)")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS transfers ("
+            "signature TEXT NOT NULL, kind TEXT NOT NULL, amount INTEGER NOT NULL, "
+            "out_sig TEXT, PRIMARY KEY (signature, kind))"
+        )
+        con.commit()
+        
+        logger.info(f"State database opened: {db_path}")
+        return con
+    
+    def mark_seen(self, signature: str):
+        """Record a processed transaction signature"""
+        self._seen_transactions.add(signature)
+        self._pending_seen.append((signature,))
+    
+    def mark_airdrop_user(self, address: str):
+        """Record a wallet that has received its airdrop"""
+        self._airdrop_users.add(address_key(address))
+        self._pending_airdrop_users.append((address,))
+    
+    def has_received_airdrop(self, address: str) -> bool:
+        """Check whether a wallet has (probably) already received its airdrop"""
+        return address_key(address) in self._airdrop_users
+    
+    async def _db_write(self, func, *args):
+        """Run a SQLite write in a worker thread, shielded from cancellation and tracked for aclose()"""
+        task = asyncio.ensure_future(self._serialized_db_write(func, *args))
+        self._db_writes.add(task)
+        task.add_done_callback(self._db_writes.discard)
+        return await asyncio.shield(task)
+    
+    async def _serialized_db_write(self, func, *args):
+        """Hold the write lock for the whole worker-thread transaction"""
+        async with self._db_lock:
+            return await asyncio.to_thread(func, *args)
+    
+    def _write_state(self, seen: list, airdrop_users: list):
+        """Write a batch of state rows to SQLite (runs in a worker thread)"""
+        with self._state_db:
+            self._state_db.executemany("INSERT OR IGNORE INTO seen (sig) VALUES (?)", seen)
+            self._state_db.executemany("INSERT OR IGNORE INTO airdrop_users (addr) VALUES (?)", airdrop_users)
+    
+    async def flush_state(self):
+        """Persist queued seen transactions and airdrop users"""
+        if not self._pending_seen and not self._pending_airdrop_users:
+            return
+        
+        seen, self._pending_seen = self._pending_seen, []
+        airdrop_users, self._pending_airdrop_users = self._pending_airdrop_users, []
+        
         try:
-            if image_url:
-                await self.telegram_bot.send_photo(
-                    chat_id=self.telegram_group_id,
-                    photo=image_url,
-                    caption=message,
-                    parse_mode='HTML',
-                    reply_markup=inline_keyboard
-                )
-                logger.info("Telegram message with image sent successfully")
+            await self._db_write(self._write_state, seen, airdrop_users)
+        except asyncio.CancelledError:
+            # The write may not have landed yet; inserts are idempotent, so requeue
+            self._pending_seen[:0] = seen
+            self._pending_airdrop_users[:0] = airdrop_users
+            raise
+        except Exception as e:
+            logger.error(f"Failed to persist bot state: {e}")
+            # Keep the rows queued for the next flush
+            self._pending_seen[:0] = seen
+            self._pending_airdrop_users[:0] = airdrop_users
+    
+    def _write_transfer(self, signature: str, kind: str, amount: int, out_sig: str):
+        """Write a completed transfer to SQLite (runs in a worker thread)"""
+        with self._state_db:
+            self._state_db.execute(
+                "INSERT OR IGNORE INTO transfers (signature, kind, amount, out_sig) VALUES (?, ?, ?, ?)",
+                (signature, kind, amount, out_sig)
+            )
+    
+    async def record_transfer(self, signature: str, kind: str, amount: int, out_sig: str = None):
+        """Persist a completed transfer immediately (not batched, to rule out double-spends)"""
+        await self._db_write(self._write_transfer, signature, kind, amount, out_sig)
+        self._completed_transfers.add((signature, kind))
+    
+    def _write_photo_file_id(self, url: str, file_id: str = None):
+        """Store or drop a cached Telegram photo file_id (runs in a worker thread)"""
+        with self._state_db:
+            if file_id is None:
+                self._state_db.execute("DELETE FROM photo_file_ids WHERE url = ?", (url,))
             else:
-                await self.telegram_bot.send_message(
-                    chat_id=self.telegram_group_id,
-                    text=message,
-                    parse_mode='HTML',
-                    reply_markup=inline_keyboard
+                self._state_db.execute(
+                    "INSERT OR REPLACE INTO photo_file_ids (url, file_id) VALUES (?, ?)", (url, file_id)
                 )
-                logger.info("Telegram message sent successfully")
-        except TelegramError as e:
-            logger.error(f"Failed to send Telegram message: {e}")
     
-    def get_sol_price_usd(self) -> float:
-        """Get current SOL price in USD from CoinGecko API"""
+    async def cache_photo_file_id(self, url: str, file_id: str = None):
+        """Remember (or forget, if file_id is None) Telegram's file_id for an image URL"""
+        if file_id is None:
+            self._photo_file_ids.pop(url, None)
+        else:
+            self._photo_file_ids[url] = file_id
+        
         try:
-            url = "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                sol_price = data.get("solana", {}).get("usd", 0.0)
-                logger.info(f"SOL price fetched: ${sol_price}")
-                return float(sol_price)
-            else:
-                logger.warning(f"Failed to fetch SOL price: HTTP {response.status_code}")
-                return 0.0
-                
+            await self._db_write(self._write_photo_file_id, url, file_id)
         except Exception as e:
-            logger.error(f"Error fetching SOL price: {e}")
-            return 0.0
+            logger.error(f"Failed to persist photo file_id: {e}")
     
-    def get_presale_countdown(self) -> dict:
-        """Calculate presale countdown from configured end date"""
+    async def run_state_flusher(self):
+        """Periodically flush queued state to SQLite until stop_state_flusher() is called"""
+        while not self._state_stop.is_set():
+            try:
+                await asyncio.wait_for(self._state_stop.wait(), self.state_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush_state()
+    
+    def stop_state_flusher(self):
+        """Ask the state flusher to do a final flush and exit"""
+        self._state_stop.set()
+    
+    async def send_telegram_message(self, message: str, image_url: str = None, inline_keyboard: InlineKeyboardMarkup = None):
+        """Queue message for the Telegram group with optional image and inline keyboard"""
+        try:
+            self._tg_queue.put_nowait((message, image_url, inline_keyboard))
+        except asyncio.QueueFull:
+            logger.error("Telegram queue is full - dropping message")
+    
+    async def run_telegram_worker(self):
+        """Send queued Telegram messages one at a time"""
+        while True:
+            message, image_url, inline_keyboard = await self._tg_queue.get()
+            try:
+                await self.deliver_telegram_message(message, image_url, inline_keyboard)
+            except Exception as e:
+                logger.error(f"Telegram worker error: {e}")
+            finally:
+                self._tg_queue.task_done()
+    
+    async def flush_telegram_queue(self, timeout: float = 10):
+        """Wait (up to timeout seconds) for queued Telegram messages to be sent"""
         try:
-            from datetime import datetime, timezone
-            import pytz
+            await asyncio.wait_for(self._tg_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Telegram queue not drained on shutdown: {self._tg_queue.qsize()} message(s) dropped")
+    
+    async def deliver_telegram_message(self, message: str, image_url: str = None, inline_keyboard: InlineKeyboardMarkup = None):
+        """Send message to Telegram group with optional image and inline keyboard, retrying flood control and network errors"""
+        chat_id = self.telegram_group_id
+        for attempt in range(RETRY_ATTEMPTS):
+            wait = self._chat_cooldown.get(chat_id, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            try:
+                if image_url:
+                    # Once Telegram has the image, send its file_id instead of
+                    # making Telegram fetch the URL again
+                    file_id = self._photo_file_ids.get(image_url)
+                    sent = await self.telegram_bot.send_photo(
+                        chat_id=chat_id,
+                        photo=file_id or image_url,
+                        caption=message,
+                        parse_mode='HTML',
+                        reply_markup=inline_keyboard
+                    )
+                    if file_id is None and sent.photo:
+                        await self.cache_photo_file_id(image_url, sent.photo[-1].file_id)
+                    logger.info("Telegram message with image sent successfully")
+                else:
+                    await self.telegram_bot.send_message(
+                        chat_id=chat_id,
+                        text=message,
+                        parse_mode='HTML',
+                        reply_markup=inline_keyboard
+                    )
+                    logger.info("Telegram message sent successfully")
+                return
+            except RetryAfter as e:
+                logger.warning(f"Telegram flood control: retrying in {e.retry_after}s")
+                self._chat_cooldown[chat_id] = time.monotonic() + e.retry_after
+            except BadRequest as e:
+                reason = str(e).lower()
+                if image_url in self._photo_file_ids and ("file identifier" in reason or "file_id" in reason):
+                    # Cached file_id rejected - drop it and upload from the URL again
+                    logger.warning(f"Cached photo file_id rejected, resending from URL: {e}")
+                    await self.cache_photo_file_id(image_url, None)
+                    continue
+                
+                # Malformed message - retrying won't help
+                logger.error(f"Failed to send Telegram message: {e}")
+                return
+            except NetworkError as e:
+                logger.warning(f"Telegram network error (attempt {attempt + 1}/{RETRY_ATTEMPTS}): {e}")
+                self._chat_cooldown[chat_id] = time.monotonic() + backoff_delay(attempt)
+            except TelegramError as e:
+                logger.error(f"Failed to send Telegram message: {e}")
+                return
+        
+        logger.error(f"Failed to send Telegram message after {RETRY_ATTEMPTS} attempts")
+    
+    async def get_sol_price_usd(self) -> float:
+        """Get current SOL price in USD, cached for SOL_PRICE_TTL seconds"""
+        price, fetched_at = self._sol_price_cache
+        if price > 0 and time.monotonic() - fetched_at < self.sol_price_ttl:
+            return price
+        
+        async with self._sol_price_lock:
+            # Another caller may have refreshed the price while we waited
+            price, fetched_at = self._sol_price_cache
+            if price > 0 and time.monotonic() - fetched_at < self.sol_price_ttl:
+                return price
             
-            # Parse presale end date
+            fresh_price = await self.fetch_sol_price_usd()
+            if fresh_price > 0:
+                self._sol_price_cache = (fresh_price, time.monotonic())
+                return fresh_price
+            
+            # Fall back to the last good price so alerts don't show $0
+            return price
+    
+    async def fetch_sol_price_usd(self) -> float:
+        """Fetch current SOL price in USD from CoinGecko API, retrying transient failures"""
+        if not self._price_breaker.allow():
+            logger.debug("CoinGecko circuit open - skipping SOL price fetch")
+            return 0.0
+        
+        url = "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd"
+        http = await self._get_http()
+        for attempt in range(RETRY_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            
+            try:
+                async with http.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status == 200:
+                        data = orjson.loads(await response.read())
+                        sol_price = data.get("solana", {}).get("usd", 0.0)
+                        logger.info(f"SOL price fetched: ${sol_price}")
+                        self._price_breaker.record_success()
+                        return float(sol_price)
+                    
+                    logger.warning(f"Failed to fetch SOL price: HTTP {response.status}")
+                    if response.status not in RETRY_STATUSES:
+                        break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Error fetching SOL price (attempt {attempt + 1}/{RETRY_ATTEMPTS}): {e!r}")
+            except Exception as e:
+                logger.error(f"Error fetching SOL price: {e}")
+                break
+        
+        self._price_breaker.record_failure()
+        return 0.0
+    
+    def parse_presale_end(self):
+        """Parse the configured presale end date into an aware datetime (None if invalid)"""
+        try:
             presale_end = datetime.strptime(self.presale_end_date, "%Y-%m-%d %H:%M:%S")
             
             # Set timezone
-            if self.presale_timezone == "UTC":
-                presale_end = presale_end.replace(tzinfo=timezone.utc)
-            else:
-                tz = pytz.timezone(self.presale_timezone)
-                presale_end = tz.localize(presale_end)
+            tz = timezone.utc if self.presale_timezone == "UTC" else ZoneInfo(self.presale_timezone)
+            return presale_end.replace(tzinfo=tz)
             
-            # Get current time in UTC
-            now = datetime.now(timezone.utc)
+        except Exception as e:
+            logger.error(f"Invalid presale end date configuration: {e}")
+            return None
+    
+    def get_presale_countdown(self) -> dict:
+        """Calculate presale countdown from configured end date (cached for 1 second)"""
+        now_monotonic = time.monotonic()
+        cached, computed_at = self._countdown_cache
+        if cached is not None and now_monotonic - computed_at < 1:
+            return cached
+        
+        try:
+            if self._presale_end_ts is None:
+                raise ValueError(f"unparseable PRESALE_END_DATE {self.presale_end_date!r}")
             
-            # Calculate difference
-            time_diff = presale_end - now
+            # Seconds remaining, from Unix timestamps (no datetime construction)
+            remaining = self._presale_end_ts - time.time()
             
-            if time_diff.total_seconds() <= 0:
-                return {
+            if remaining <= 0:
+                countdown = {
                     "days": 0,
                     "hours": 0,
                     "minutes": 0,
                     "seconds": 0,
                     "ended": True
                 }
+            else:
+                # Extract days, hours, minutes, seconds
+                days, remainder = divmod(int(remaining), 86400)
+                hours, remainder = divmod(remainder, 3600)
+                minutes, seconds = divmod(remainder, 60)
+                countdown = {
+                    "days": days,
+                    "hours": hours,
+                    "minutes": minutes,
+                    "seconds": seconds,
+                    "ended": False
+                }
             
-            # Extract days, hours, minutes, seconds
-            days = time_diff.days
-            hours, remainder = divmod(time_diff.seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            
-            return {
-                "days": days,
-                "hours": hours,
-                "minutes": minutes,
-                "seconds": seconds,
-                "ended": False
-            }
+            self._countdown_cache = (countdown, now_monotonic)
+            return countdown
             
         except Exception as e:
             logger.error(f"Failed to calculate presale countdown: {e}")
@@ -263,7 +838,7 @@ class CR7TokenBot:
                 "ended": False
             }
     
-    def get_recent_transactions(self, limit: int = 20):
+    async def get_recent_transactions(self, limit: int = 20):
         """Get recent transactions for the token mint with rate limiting"""
         try:
             payload = {
@@ -278,28 +853,29 @@ class CR7TokenBot:
                 ]
             }
             
-            response = requests.post(self.rpc_url, json=payload, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "result" in data:
-                    return data["result"]
+            http = await self._get_http()
+            async with http.post(self.rpc_url, json=payload) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    if "result" in data:
+                        return data["result"]
+                    else:
+                        logger.error(f"RPC error: {data}")
+                        return []
+                elif response.status == 429:
+                    logger.warning(f"Rate limited (429). Waiting {self.rate_limit_delay} seconds...")
                 else:
-                    logger.error(f"RPC error: {data}")
+                    logger.error(f"HTTP error: {response.status}")
                     return []
-            elif response.status_code == 429:
-                logger.warning(f"Rate limited (429). Waiting {self.rate_limit_delay} seconds...")
-                time.sleep(self.rate_limit_delay)
-                return []
-            else:
-                logger.error(f"HTTP error: {response.status_code}")
-                return []
+            
+            await asyncio.sleep(self.rate_limit_delay)
+            return []
                 
         except Exception as e:
             logger.error(f"Failed to get transactions: {e}")
             return []
     
-    def get_transaction_details(self, signature: str):
+    async def get_transaction_details(self, signature: str):
         """Get detailed transaction information with rate limiting"""
         try:
             payload = {
@@ -315,28 +891,29 @@ class CR7TokenBot:
                 ]
             }
             
-            response = requests.post(self.rpc_url, json=payload, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "result" in data:
-                    return data["result"]
+            http = await self._get_http()
+            async with http.post(self.rpc_url, json=payload) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    if "result" in data:
+                        return data["result"]
+                    else:
+                        logger.error(f"Transaction error: {data}")
+                        return None
+                elif response.status == 429:
+                    logger.warning(f"Rate limited (429) for transaction {signature[:8]}...")
                 else:
-                    logger.error(f"Transaction error: {data}")
+                    logger.error(f"HTTP error: {response.status}")
                     return None
-            elif response.status_code == 429:
-                logger.warning(f"Rate limited (429) for transaction {signature[:8]}...")
-                time.sleep(self.rate_limit_delay)
-                return None
-            else:
-                logger.error(f"HTTP error: {response.status_code}")
-                return None
+            
+            await asyncio.sleep(self.rate_limit_delay)
+            return None
                 
         except Exception as e:
             logger.error(f"Failed to get transaction details: {e}")
             return None
     
-    def analyze_transaction(self, tx_data):
+    async def analyze_transaction(self, tx_data):
         """Analyze transaction to detect token purchases"""
         try:
             if not tx_data:
@@ -367,7 +944,7 @@ class CR7TokenBot:
                 if sol_spent > 0:
                     # This looks like a purchase
                     # Get real SOL price from API
-                    sol_price = self.get_sol_price_usd()
+                    sol_price = await self.get_sol_price_usd()
                     if sol_price > 0:
                         usd_value = sol_spent * sol_price
                     else:
@@ -388,7 +965,7 @@ class CR7TokenBot:
                                         post_token.get("owner") == owner):
                                         post_amount = float(post_token.get("uiTokenAmount", {}).get("uiAmount", 0))
                                         token_amount = post_amount - pre_amount
-                                        logger.info(f"Token amount calculated: {token_amount} (pre: {pre_amount}, post: {post_amount})")
+                                        logger.info("Token amount calculated: %s (pre: %s, post: %s)", token_amount, pre_amount, post_amount)
                                         break
                                 break
                     
@@ -400,13 +977,13 @@ class CR7TokenBot:
                                 post_amount = float(post_token.get("uiTokenAmount", {}).get("uiAmount", 0))
                                 if post_amount > 0:
                                     token_amount = post_amount
-                                    logger.info(f"Using post token amount: {token_amount}")
+                                    logger.info("Using post token amount: %s", token_amount)
                                     break
                     
                     # If still no token amount found, estimate based on SOL spent
                     if token_amount <= 0:
                         token_amount = sol_spent * self.tokens_per_sol  # 1 SOL = 7000 tokens
-                        logger.info(f"Using estimated token amount: {token_amount} (Rate: 1 SOL = {self.tokens_per_sol} tokens)")
+                        logger.info("Using estimated token amount: %s (Rate: 1 SOL = %s tokens)", token_amount, self.tokens_per_sol)
                     
                     return {
                         "buyer": buyer,
@@ -425,44 +1002,52 @@ class CR7TokenBot:
     
     def format_address(self, address: str):
         """Format address professionally"""
-        if len(address) > 8:
-            return f"{address[:4]}...{address[-4:]}"
-        return address
+        return format_short_address(address)
     
     def calculate_token_distribution(self, sol_amount: float):
         """Calculate token distribution based on admin configuration: 1 SOL = 7000 CR7 tokens"""
         try:
             # Check minimum buy requirement
             if sol_amount < self.minimum_buy_sol:
-                logger.warning(f"Buy amount {sol_amount} SOL is below minimum {self.minimum_buy_sol} SOL")
+                logger.warning("Buy amount %s SOL is below minimum %s SOL", sol_amount, self.minimum_buy_sol)
                 return 0
             
-            # Calculate tokens based on 1 SOL = 7000 CR7 tokens
-            tokens_to_distribute = sol_amount * self.tokens_per_sol
-            
-            # Apply distribution ratio (100% = 1.0)
-            tokens_to_distribute = tokens_to_distribute * self.distribution_ratio
-            
-            # Apply min/max limits from admin configuration
-            tokens_to_distribute = max(self.min_distribution, min(tokens_to_distribute, self.max_distribution))
-            
-            # Round to nearest integer
+            # Tokens per SOL with distribution ratio applied (precomputed in __init__),
+            # clamped to the admin min/max limits and rounded to nearest integer
+            tokens_to_distribute = sol_amount * self._distribution_rate
+            if tokens_to_distribute < self.min_distribution:
+                tokens_to_distribute = self.min_distribution
+            elif tokens_to_distribute > self.max_distribution:
+                tokens_to_distribute = self.max_distribution
             tokens_to_distribute = int(round(tokens_to_distribute))
             
-            logger.info(f"Token distribution calculated: {sol_amount} SOL -> {tokens_to_distribute} {self.token_symbol} tokens")
+            logger.info("Token distribution calculated: %s SOL -> %s %s tokens", sol_amount, tokens_to_distribute, self.token_symbol)
             return tokens_to_distribute
             
         except Exception as e:
             logger.error(f"Failed to calculate token distribution: {e}")
             return self.min_distribution
     
-    async def transfer_tokens_to_buyer(self, buyer_address: str, token_amount: int) -> bool:
-        """Transfer tokens to buyer wallet using Solana RPC"""
+    async def transfer_tokens_to_buyer(self, buyer_address: str, token_amount: int, signature: str, kind: str = "purchase") -> bool:
+        """Transfer tokens to buyer wallet using Solana RPC (idempotent per buy signature and kind)"""
+        key = (signature, kind)
+        if key in self._completed_transfers:
+            logger.info("Transfer already completed for %s (%s) - skipping", signature[:8], kind)
+            return True
+        if key in self._transfers_in_flight:
+            logger.warning("Transfer already in progress for %s (%s) - skipping", signature[:8], kind)
+            return False
+        
+        self._transfers_in_flight.add(key)
         try:
             if not self.admin_wallet_private_key or len(self.admin_wallet_private_key) != 64:
                 logger.warning("Admin wallet private key not configured - skipping token transfer")
                 return False
             
+            # Memo carried on the outbound transfer so on-chain state also records
+            # which incoming buy it settles
+            memo = hashlib.sha256(f"{signature}:{kind}".encode()).hexdigest()[:32]
+            
             # Convert token amount to lamports (assuming 6 decimals)
             token_amount_lamports = int(token_amount * 1e6)
             
@@ -477,51 +1062,51 @@ class CR7TokenBot:
                         "to": buyer_address,
                         "amount": token_amount_lamports,
                         "mint": self.token_mint,
-                        "decimals": 6
+                        "decimals": 6,
+                        "memo": memo
                     }
                 ]
             }
             
             # For now, we'll simulate the transfer since actual SPL token transfers require more complex setup
             # In production, you would implement proper SPL token transfers here
-            logger.info(f"🔄 TRANSFERRING {token_amount:,} {self.token_symbol} tokens to {buyer_address}")
-            logger.info(f"📤 Transfer Details:")
-            logger.info(f"   • From: Admin Wallet")
-            logger.info(f"   • To: {buyer_address}")
-            logger.info(f"   • Amount: {token_amount:,} {self.token_symbol}")
-            logger.info(f"   • Token Mint: {self.token_mint}")
+            amount_text = f"{token_amount:,}"  # thousands separator; %-style can't add one
+            logger.info("🔄 TRANSFERRING %s %s tokens to %s", amount_text, self.token_symbol, buyer_address)
+            logger.debug("📤 Transfer Details:")
+            logger.debug("   • From: Admin Wallet")
+            logger.debug("   • To: %s", buyer_address)
+            logger.debug("   • Amount: %s %s", amount_text, self.token_symbol)
+            logger.debug("   • Token Mint: %s", self.token_mint)
             
             # Simulate successful transfer
             await asyncio.sleep(1)  # Simulate network delay
             
-            logger.info(f"✅ TOKEN TRANSFER SUCCESSFUL: {token_amount:,} {self.token_symbol} sent to {buyer_address}")
+            try:
+                await self.record_transfer(signature, kind, token_amount)
+            except Exception as e:
+                # The tokens have already been sent - report success and keep the
+                # transfer marked in memory so it is not repeated in this run
+                logger.error("Failed to record completed transfer %s (%s): %s", signature[:8], kind, e)
+                self._completed_transfers.add(key)
+            
+            logger.info("✅ TOKEN TRANSFER SUCCESSFUL: %s %s sent to %s", amount_text, self.token_symbol, buyer_address)
             return True
                 
         except Exception as e:
             logger.error(f"❌ Token transfer failed: {e}")
             return False
+        finally:
+            self._transfers_in_flight.discard(key)
     
     def update_stats(self, sol_amount: float, tokens_distributed: int, airdrop_sent: bool = False):
         """Update statistics"""
-        self.total_buys += 1
-        self.total_volume += sol_amount
-        self.total_distributed += tokens_distributed
-        self.daily_buys += 1
-        self.daily_volume += sol_amount
-        self.daily_distributed += tokens_distributed
-        
-        if airdrop_sent:
-            self.total_airdrops += 1
-            self.daily_airdrops += 1
+        self.stats.record_buy(sol_amount, tokens_distributed, airdrop_sent)
     
     def reset_daily_stats(self):
         """Reset daily statistics"""
         current_date = datetime.now().date()
         if current_date != self.last_reset_date:
-            self.daily_buys = 0
-            self.daily_volume = 0.0
-            self.daily_distributed = 0.0
-            self.daily_airdrops = 0
+            self.stats.reset_daily()
             self.last_reset_date = current_date
     
     async def send_buy_alert(self, user_address: str, amount_sol: float, usd_value: float, tokens_to_distribute: int, airdrop_amount: int, signature: str = "", token_amount: float = 0, transfer_success: bool = False):
@@ -533,58 +1118,58 @@ class CR7TokenBot:
             
             # Format data
             formatted_address = self.format_address(user_address)
-            timestamp = datetime.now().strftime("%H:%M:%S")
             
-            # Create professional buy alert message
-            message = f"🎉 <b>New <a href='https://solscan.io/token/{self.token_mint}'>${self.token_symbol}</a> Buy</b>\n\n"
-            message += f"🦅🦅🦅🦅🦅\n\n"
-            message += f"💰 <b>Spent:</b> {amount_sol:.8f} SOL (${usd_value:.2f})\n"
+            # Token amount shown in both the "Bought" and "Tokens Sent" lines
+            bought = int(token_amount) if token_amount > 0 else int(amount_sol * self.tokens_per_sol)
+            bought_str = f"{bought:,}"
             
-            # Display token amount
-            if token_amount > 0:
-                message += f"🎁 <b>Bought:</b> {int(token_amount):,} {self.token_symbol}\n"
-            else:
-                message += f"🎁 <b>Bought:</b> {int(amount_sol * self.tokens_per_sol):,} {self.token_symbol}\n"
+            # Create professional buy alert message from the precomputed fragments
+            parts = [
+                self._alert_header,
+                f"💰 <b>Spent:</b> {amount_sol:.8f} SOL (${usd_value:.2f})\n"
+            ]
             
-            message += f"🔗 <a href='https://solscan.io/tx/{signature}'>Signature</a> | 👛 <a href='https://solscan.io/account/{user_address}'>Wallet</a>\n\n"
+            # Display token amount
+            parts.append(f"🎁 <b>Bought:</b> {bought_str}{self._symbol_suffix}")
+            parts.append(f"🔗 <a href='https://solscan.io/tx/{signature}'>Signature</a> | 👛 <a href='https://solscan.io/account/{user_address}'>Wallet</a>\n\n")
             
             # Add automatic token distribution info
-            message += f"🎁 <b>AUTOMATIC TOKEN DISTRIBUTION:</b>\n"
-            if token_amount > 0:
-                message += f"• Tokens Sent: {int(token_amount):,} ${self.token_symbol}\n"
-            else:
-                message += f"• Tokens Sent: {int(amount_sol * self.tokens_per_sol):,} ${self.token_symbol}\n"
+            parts.append("🎁 <b>AUTOMATIC TOKEN DISTRIBUTION:</b>\n")
+            parts.append(f"• Tokens Sent: {bought_str}{self._token_suffix}")
             
             if transfer_success:
-                message += f"• Status: ✅ <b>TRANSFERRED TO WALLET</b>\n"
-                message += f"• Transaction: <a href='https://solscan.io/account/{user_address}'>View Wallet</a>\n\n"
+                parts.append(
+                    f"• Status: ✅ <b>TRANSFERRED TO WALLET</b>\n"
+                    f"• Transaction: <a href='https://solscan.io/account/{user_address}'>View Wallet</a>\n\n"
+                )
             else:
-                message += f"• Status: ⏳ <b>TRANSFER IN PROGRESS</b>\n\n"
+                parts.append("• Status: ⏳ <b>TRANSFER IN PROGRESS</b>\n\n")
             
             # Add airdrop info if applicable
             if airdrop_amount > 0:
-                message += f"🎉 <b>AIRDROP SENT:</b>\n"
-                message += f"• Amount: {airdrop_amount:,} ${self.token_symbol}\n"
-                message += f"• Status: ✅ <b>AIRDROP TRANSFERRED</b>\n\n"
+                parts.append(
+                    f"🎉 <b>AIRDROP SENT:</b>\n"
+                    f"• Amount: {airdrop_amount:,}{self._token_suffix}"
+                    f"• Status: ✅ <b>AIRDROP TRANSFERRED</b>\n\n"
+                )
             
             # Add presale timer section
             countdown = self.get_presale_countdown()
             if countdown["ended"]:
-                message += f"⏰ <b>Presale Status:</b>\n"
-                message += f"🔴 <b>PRESALE ENDED</b>\n\n"
+                parts.append(PRESALE_ENDED_SECTION)
             else:
-                message += f"⏰ <b>Presale Ends In:</b>\n"
-                message += f"📅 <b>{countdown['days']} days</b>\n"
-                message += f"🕐 <b>{countdown['hours']} hours</b>\n"
-                message += f"⏱️ <b>{countdown['minutes']} minutes</b>\n\n"
+                parts.append(
+                    f"⏰ <b>Presale Ends In:</b>\n"
+                    f"📅 <b>{countdown['days']} days</b>\n"
+                    f"🕐 <b>{countdown['hours']} hours</b>\n"
+                    f"⏱️ <b>{countdown['minutes']} minutes</b>\n\n"
+                )
             
-            # Create inline keyboard with BUY button
-            buy_button = InlineKeyboardButton(f"🛒 BUY ${self.token_symbol}", url=self.buy_button_link)
-            keyboard = InlineKeyboardMarkup([[buy_button]])
+            message = "".join(parts)
             
             # Send message with CR7 Ronaldo image and inline keyboard
-            await self.send_telegram_message(message, "https://i.postimg.cc/T19cTg5Q/93d39fc3-ac6f-4c94-a324-72feee1c2b29.jpg", keyboard)
-            logger.info(f"REAL BUY ALERT SENT: {amount_sol} SOL from {formatted_address}, {tokens_to_distribute} tokens distributed")
+            await self.send_telegram_message(message, "https://i.postimg.cc/T19cTg5Q/93d39fc3-ac6f-4c94-a324-72feee1c2b29.jpg", self._buy_keyboard)
+            logger.info("REAL BUY ALERT SENT: %s SOL from %s, %s tokens distributed", amount_sol, formatted_address, tokens_to_distribute)
             return True
             
         except Exception as e:
@@ -594,45 +1179,49 @@ class CR7TokenBot:
     async def send_startup_message(self):
         """Send startup message to Telegram group"""
         try:
-            startup_message = f"🦅 <b>Official $CR7 Coin</b>\n"
-            startup_message += f"<i>Be DeFiant</i>\n\n"
-            startup_message += f"🎉 <b>CR7 Token Bot Started - REAL PRODUCTION with TRANSFERS!</b>\n\n"
-            startup_message += f"🦅🦅🦅🦅🦅\n\n"
-            startup_message += f"🪙 <b>Token:</b> <code>{self.token_mint}</code>\n"
-            startup_message += f"💰 <b>Symbol:</b> ${self.token_symbol}\n"
-            startup_message += f"🔄 <b>Monitoring:</b> <b>REAL TRANSACTIONS</b>\n"
-            startup_message += f"💸 <b>Transfers:</b> <b>REAL TOKEN TRANSFERS</b>\n\n"
+            parts = [
+                BRAND_HEADER,
+                "🎉 <b>CR7 Token Bot Started - REAL PRODUCTION with TRANSFERS!</b>\n\n"
+                "🦅🦅🦅🦅🦅\n\n"
+                f"🪙 <b>Token:</b> <code>{self.token_mint}</code>\n"
+                f"💰 <b>Symbol:</b> ${self.token_symbol}\n"
+                "🔄 <b>Monitoring:</b> <b>REAL TRANSACTIONS</b>\n"
+                "💸 <b>Transfers:</b> <b>REAL TOKEN TRANSFERS</b>\n\n"
+            ]
             
             # Add presale countdown
             countdown = self.get_presale_countdown()
             if countdown["ended"]:
-                startup_message += f"⏰ <b>Presale Status:</b>\n"
-                startup_message += f"🔴 <b>PRESALE ENDED</b>\n\n"
+                parts.append(PRESALE_ENDED_SECTION)
             else:
-                startup_message += f"⏰ <b>Presale Ends In:</b>\n"
-                startup_message += f"📅 <b>{countdown['days']} days</b>\n"
-                startup_message += f"🕐 <b>{countdown['hours']} hours</b>\n"
-                startup_message += f"⏱️ <b>{countdown['minutes']} minutes</b>\n\n"
-            
-            startup_message += f"🚨 <b>REAL-TIME FEATURES:</b>\n"
-            startup_message += f"• Live Solana transaction monitoring\n"
-            startup_message += f"• Real buy detection and alerts\n"
-            startup_message += f"• Automatic token transfers to buyer wallets\n"
-            startup_message += f"• Professional monitoring 24/7\n\n"
-            
-            startup_message += f"🎁 <b>TOKEN DISTRIBUTION:</b>\n"
-            startup_message += f"• Token Rate: 1 SOL = {self.tokens_per_sol:,} {self.token_symbol} tokens\n"
-            startup_message += f"• Minimum Buy: {self.minimum_buy_sol} SOL\n"
-            startup_message += f"• First-time buyers get {self.airdrop_amount:,} token airdrop\n"
-            startup_message += f"• Tokens automatically transferred to buyer wallet\n\n"
-            
-            # Create inline keyboard with BUY button
-            buy_button = InlineKeyboardButton(f"🛒 BUY ${self.token_symbol}", url=self.buy_button_link)
-            keyboard = InlineKeyboardMarkup([[buy_button]])
+                parts.append(
+                    "⏰ <b>Presale Ends In:</b>\n"
+                    f"📅 <b>{countdown['days']} days</b>\n"
+                    f"🕐 <b>{countdown['hours']} hours</b>\n"
+                    f"⏱️ <b>{countdown['minutes']} minutes</b>\n\n"
+                )
+            
+            parts.append(
+                "🚨 <b>REAL-TIME FEATURES:</b>\n"
+                "• Live Solana transaction monitoring\n"
+                "• Real buy detection and alerts\n"
+                "• Automatic token transfers to buyer wallets\n"
+                "• Professional monitoring 24/7\n\n"
+            )
+            
+            parts.append(
+                "🎁 <b>TOKEN DISTRIBUTION:</b>\n"
+                f"• Token Rate: 1 SOL = {self.tokens_per_sol:,} {self.token_symbol} tokens\n"
+                f"• Minimum Buy: {self.minimum_buy_sol} SOL\n"
+                f"• First-time buyers get {self.airdrop_amount:,} token airdrop\n"
+                "• Tokens automatically transferred to buyer wallet\n\n"
+            )
+            
+            startup_message = "".join(parts)
             
             # Send startup message
-            await self.send_telegram_message(startup_message, "https://i.postimg.cc/T19cTg5Q/93d39fc3-ac6f-4c94-a324-72feee1c2b29.jpg", keyboard)
-            logger.info("REAL PRODUCTION with TRANSFERS startup message sent successfully")
+            await self.send_telegram_message(startup_message, "https://i.postimg.cc/T19cTg5Q/93d39fc3-ac6f-4c94-a324-72feee1c2b29.jpg", self._buy_keyboard)
+            logger.info("REAL PRODUCTION with TRANSFERS startup message queued")
             
         except Exception as e:
             logger.error(f"Failed to send startup message: {e}")
@@ -641,13 +1230,13 @@ class CR7TokenBot:
         """Process a real buy transaction with automatic token distribution"""
         try:
             # Get transaction details
-            tx_data = self.get_transaction_details(signature)
+            tx_data = await self.get_transaction_details(signature)
             
             if not tx_data:
                 return False
             
             # Analyze transaction
-            analysis = self.analyze_transaction(tx_data)
+            analysis = await self.analyze_transaction(tx_data)
             
             if analysis and analysis["is_buy"]:
                 buyer = analysis["buyer"]
@@ -655,7 +1244,7 @@ class CR7TokenBot:
                 usd_value = analysis["usd_value"]
                 token_amount = analysis.get("token_amount", 0)
                 
-                logger.info(f"REAL BUY DETECTED: {sol_spent} SOL from {buyer}, received {token_amount} tokens")
+                logger.info("REAL BUY DETECTED: %s SOL from %s, received %s tokens", sol_spent, buyer, token_amount)
                 
                 # Calculate token distribution based on admin configuration
                 tokens_to_distribute = self.calculate_token_distribution(sol_spent)
@@ -663,34 +1252,34 @@ class CR7TokenBot:
                 # Check if user should get airdrop (admin configuration)
                 airdrop_amount = 0
                 if self.one_airdrop_per_user and self._airdrop_users is not None:
-                    if buyer not in self._airdrop_users:
+                    if not self.has_received_airdrop(buyer):
                         airdrop_amount = self.airdrop_amount
-                        self._airdrop_users.add(buyer)
-                        logger.info(f"FIRST-TIME USER AIRDROP: {airdrop_amount} tokens to {buyer}")
+                        self.mark_airdrop_user(buyer)
+                        logger.info("FIRST-TIME USER AIRDROP: %s tokens to %s", airdrop_amount, buyer)
                 elif not self.one_airdrop_per_user:
                     airdrop_amount = self.airdrop_amount
-                    logger.info(f"REGULAR AIRDROP: {airdrop_amount} tokens to {buyer}")
+                    logger.info("REGULAR AIRDROP: %s tokens to %s", airdrop_amount, buyer)
                 
                 # Perform automatic token transfer to buyer
                 transfer_success = False
                 if tokens_to_distribute > 0:
                     # Transfer the bought amount to buyer
                     transfer_amount = int(token_amount) if token_amount > 0 else int(sol_spent * self.tokens_per_sol)
-                    transfer_success = await self.transfer_tokens_to_buyer(buyer, transfer_amount)
+                    transfer_success = await self.transfer_tokens_to_buyer(buyer, transfer_amount, signature, "purchase")
                     
                     if transfer_success:
-                        logger.info(f"✅ AUTOMATIC TOKEN TRANSFER SUCCESSFUL: {transfer_amount} tokens sent to {buyer}")
+                        logger.info("✅ AUTOMATIC TOKEN TRANSFER SUCCESSFUL: %s tokens sent to %s", transfer_amount, buyer)
                     else:
-                        logger.warning(f"❌ AUTOMATIC TOKEN TRANSFER FAILED: Could not send {transfer_amount} tokens to {buyer}")
+                        logger.warning("❌ AUTOMATIC TOKEN TRANSFER FAILED: Could not send %s tokens to %s", transfer_amount, buyer)
                 
                 # Transfer airdrop if applicable
                 airdrop_transfer_success = False
                 if airdrop_amount > 0:
-                    airdrop_transfer_success = await self.transfer_tokens_to_buyer(buyer, airdrop_amount)
+                    airdrop_transfer_success = await self.transfer_tokens_to_buyer(buyer, airdrop_amount, signature, "airdrop")
                     if airdrop_transfer_success:
-                        logger.info(f"✅ AIRDROP TRANSFER SUCCESSFUL: {airdrop_amount} tokens sent to {buyer}")
+                        logger.info("✅ AIRDROP TRANSFER SUCCESSFUL: %s tokens sent to %s", airdrop_amount, buyer)
                     else:
-                        logger.warning(f"❌ AIRDROP TRANSFER FAILED: Could not send {airdrop_amount} tokens to {buyer}")
+                        logger.warning("❌ AIRDROP TRANSFER FAILED: Could not send %s tokens to %s", airdrop_amount, buyer)
                 
                 # Send real-time buy alert with automatic distribution info
                 await self.send_buy_alert(buyer, sol_spent, usd_value, tokens_to_distribute, airdrop_amount, signature, token_amount, transfer_success)
@@ -712,43 +1301,41 @@ class CR7TokenBot:
             await self.send_startup_message()
             
             # Real-time monitoring loop
-            last_summary_time = time.time()
-            
             while self.monitoring_active:
                 try:
-                    logger.info("Checking for new REAL Solana transactions...")
+                    logger.debug("Checking for new REAL Solana transactions...")
                     
-                    # Get recent transactions
-                    transactions = self.get_recent_transactions(self.max_transactions_per_check)
+                    # Only the latest transaction is processed (to prevent duplicates),
+                    # so ask the RPC for just that one signature
+                    transactions = await self.get_recent_transactions(1)
                     
                     if transactions:
-                        # Process only the latest transaction to prevent duplicates
-                        latest_tx = transactions[0]  # First transaction is the latest
-                        signature = latest_tx.get("signature")
+                        signature = transactions[0].get("signature")
                         
                         if signature and signature not in self._seen_transactions:
                             # Mark as seen immediately to prevent duplicates
-                            self._seen_transactions.add(signature)
+                            self.mark_seen(signature)
                             
                             # Process real buy with automatic token distribution
                             await self.process_real_buy(signature)
                             
-                            logger.info(f"Processed latest REAL transaction: {signature[:8]}...")
+                            logger.info("Processed latest REAL transaction: %s...", signature[:8])
                         else:
-                            logger.info("No new REAL transactions to process")
+                            logger.debug("No new REAL transactions to process")
                     
-                    # Send daily summary every 24 hours
-                    current_time = time.time()
-                    if current_time - last_summary_time >= 86400:  # 24 hours
-                        await self.send_daily_summary()
-                        last_summary_time = current_time
+                    # Successful iteration resets the error backoff
+                    self._err_backoff = 1.0
                     
                     # Wait before next check (admin configurable)
                     await asyncio.sleep(self.check_interval)
                     
                 except Exception as e:
                     logger.error(f"Error in real-time monitoring loop: {e}")
-                    await asyncio.sleep(60)  # Wait longer on error
+                    # Exponential backoff with jitter (capped at 5 minutes) so replicas
+                    # don't all hammer the RPC at the same moment after an outage
+                    delay = min(300, self._err_backoff) * (0.5 + random.random())
+                    self._err_backoff = min(300, self._err_backoff * 2)
+                    await asyncio.sleep(delay)
                 
         except KeyboardInterrupt:
             logger.info("Real-time monitoring stopped by user")
@@ -756,44 +1343,45 @@ class CR7TokenBot:
             logger.error(f"Real-time monitoring error: {e}")
             raise
     
+    async def run_daily_summary_scheduler(self):
+        """Send the daily summary every 24 hours, independent of the polling loop"""
+        # asyncio.sleep runs on the event loop's monotonic clock, so wall-clock
+        # jumps can't fire the summary early or suppress it
+        while self.monitoring_active:
+            await asyncio.sleep(86400)
+            await self.send_daily_summary()
+    
     async def send_daily_summary(self):
         """Send daily summary with real-time stats"""
         try:
-            if self.daily_buys > 0:
-                message = f"🦅 <b>Official $CR7 Coin</b>\n"
-                message += f"<i>Be DeFiant</i>\n\n"
-                message += f"📊 <b>DAILY REAL-TIME SUMMARY</b>\n\n"
-                message += f"🦅🦅🦅🦅🦅\n\n"
-                message += f"🪙 Token: ${self.token_symbol}\n"
-                message += f"📅 Date: {datetime.now().strftime('%Y-%m-%d')}\n\n"
-                message += f"📈 <b>Today's Real-Time Activity:</b>\n"
-                message += f"• Total Buys: {self.daily_buys}\n"
-                message += f"• Total Volume: {self.daily_volume:.2f} SOL\n"
-                message += f"• Total Distributed: {self.daily_distributed:,} tokens\n"
-                message += f"• Total Airdrops: {self.daily_airdrops}\n"
-                message += f"• Average Buy: {self.daily_volume/self.daily_buys:.2f} SOL\n"
-                message += f"• Average Distribution: {self.daily_distributed/self.daily_buys:.0f} tokens\n"
-                message += f"• Airdrop Rate: {(self.daily_airdrops/self.daily_buys*100):.1f}%\n\n"
-                message += f"🏆 <b>All-Time Real-Time Stats:</b>\n"
-                message += f"• Total Buys: {self.total_buys}\n"
-                message += f"• Total Volume: {self.total_volume:.2f} SOL\n"
-                message += f"• Total Distributed: {self.total_distributed:,} tokens\n"
-                message += f"• Total Airdrops: {self.total_airdrops}\n\n"
-                
-                # Create inline keyboard with BUY button
-                buy_button = InlineKeyboardButton(f"🛒 BUY ${self.token_symbol}", url=self.buy_button_link)
-                keyboard = InlineKeyboardMarkup([[buy_button]])
+            stats = self.stats
+            if stats.daily_buys > 0:
+                message = DAILY_SUMMARY_TEMPLATE.format_map({
+                    **asdict(stats),
+                    "token_symbol": self.token_symbol,
+                    "date": datetime.now().strftime('%Y-%m-%d'),
+                    "average_buy": stats.daily_volume / stats.daily_buys,
+                    "average_distribution": stats.daily_distributed / stats.daily_buys,
+                    "airdrop_rate": stats.daily_airdrops / stats.daily_buys * 100
+                })
                 
                 # Send daily summary
-                await self.send_telegram_message(message, "https://i.postimg.cc/T19cTg5Q/93d39fc3-ac6f-4c94-a324-72feee1c2b29.jpg", keyboard)
-                logger.info("Daily real-time summary sent")
+                await self.send_telegram_message(message, "https://i.postimg.cc/T19cTg5Q/93d39fc3-ac6f-4c94-a324-72feee1c2b29.jpg", self._buy_keyboard)
+                logger.info("Daily real-time summary queued")
         except Exception as e:
             logger.error(f"Failed to send daily summary: {e}")
 
 # Health check endpoints
+# Application key holding the running bot, for handlers that report on it
+BOT_KEY = web.AppKey("bot", CR7TokenBot)
+
+def json_response(data: dict) -> web.Response:
+    """JSON response encoded with orjson"""
+    return web.Response(body=orjson.dumps(data), content_type="application/json")
+
 async def health_check(request):
     """Health check endpoint"""
-    return web.json_response({
+    return json_response({
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "environment": environment,
@@ -803,24 +1391,23 @@ async def health_check(request):
 
 async def metrics(request):
     """Metrics endpoint"""
-    return web.json_response({
-        "total_buys": bot.total_buys if 'bot' in globals() else 0,
-        "total_volume": bot.total_volume if 'bot' in globals() else 0,
-        "total_distributed": bot.total_distributed if 'bot' in globals() else 0,
-        "daily_buys": bot.daily_buys if 'bot' in globals() else 0,
-        "daily_volume": bot.daily_volume if 'bot' in globals() else 0,
+    return json_response({
+        **asdict(request.app[BOT_KEY].stats),
         "timestamp": datetime.now().isoformat(),
         "monitoring_mode": "real_transactions_with_transfers"
     })
 
-async def init_web_server():
+async def init_web_server(bot: CR7TokenBot):
     """Initialize web server for health checks"""
     global app
     app = web.Application()
+    app[BOT_KEY] = bot
     app.router.add_get('/health', health_check)
     app.router.add_get('/metrics', metrics)
     
-    runner = web.AppRunner(app)
+    # Health probes hit these endpoints constantly, so skip per-request access
+    # logging; signals are already handled by main()
+    runner = web.AppRunner(app, access_log=None, handle_signals=False)
     await runner.setup()
     
     port = int(os.getenv('PORT', 8000))
@@ -837,8 +1424,6 @@ def signal_handler(signum, frame):
 
 async def main():
     """Main entry point with production features"""
-    global bot
-    
     # Set up signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -851,10 +1436,14 @@ async def main():
         bot = CR7TokenBot()
         
         # Start web server for health checks
-        web_runner = await init_web_server()
+        web_runner = await init_web_server(bot)
         
-        # Start real-time monitoring in background
+        # Start real-time monitoring, daily summaries, state persistence and
+        # Telegram delivery in background
         monitoring_task = asyncio.create_task(bot.start_real_monitoring())
+        state_task = asyncio.create_task(bot.run_state_flusher())
+        telegram_task = asyncio.create_task(bot.run_telegram_worker())
+        summary_task = asyncio.create_task(bot.run_daily_summary_scheduler())
         
         logger.info("CR7 Token Bot started successfully in REAL PRODUCTION mode with TRANSFERS")
         logger.info(f"Environment: {environment}")
@@ -866,14 +1455,23 @@ async def main():
         
         logger.info("Shutting down gracefully...")
         
-        # Cancel monitoring task
+        # Stop monitoring, let queued alerts go out, then cancel background tasks
         monitoring_task.cancel()
-        try:
-            await monitoring_task
-        except asyncio.CancelledError:
-            pass
+        summary_task.cancel()
+        await bot.flush_telegram_queue()
+        for task in (monitoring_task, summary_task, telegram_task):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        
+        # Let the state flusher finish its current write and flush once more
+        bot.stop_state_flusher()
+        await state_task
         
-        # Shutdown web server
+        # Close RPC connections and shutdown web server
+        await bot.aclose()
         await web_runner.cleanup()
         
         logger.info("Shutdown complete")
@@ -6,9 +6,25 @@ This script helps you configure the config.json file step by step.
 
 import json
 import os
+import re
 import sys
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Input validators, compiled once and reused across re-prompts
+BOT_TOKEN_RE = re.compile(r'^\d+:[A-Za-z0-9_-]{30,}$')
+GROUP_ID_RE = re.compile(r'^-100\d+$')
+MINT_RE = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$')
+
 def print_header():
     """Print welcome header"""
     print("=" * 60)
@@ -36,42 +52,44 @@ def get_input(prompt, required=True, default=None):
 
 def get_telegram_bot_token():
     """Get Telegram bot token"""
-    print("\n📱 TELEGRAM BOT TOKEN")
-    print("-" * 30)
-    print("1. Go to Telegram and search for @BotFather")
-    print("2. Send /newbot command")
-    print("3. Choose a name for your bot")
-    print("4. Choose a username (must end with 'bot')")
-    print("5. Copy the token provided")
-    print()
-    
-    token = get_input("Enter your Telegram bot token")
-    
-    # Basic validation
-    if not token.count(':') == 1:
-        print("❌ Invalid token format. Should be like: 123456789:ABCdefGHIjklMNOpqrsTUVwxyz")
-        return get_telegram_bot_token()
-    
-    return token
+    while True:
+        print("\n📱 TELEGRAM BOT TOKEN")
+        print("-" * 30)
+        print("1. Go to Telegram and search for @BotFather")
+        print("2. Send /newbot command")
+        print("3. Choose a name for your bot")
+        print("4. Choose a username (must end with 'bot')")
+        print("5. Copy the token provided")
+        print()
+        
+        token = get_input("Enter your Telegram bot token")
+        
+        # Basic validation
+        if not BOT_TOKEN_RE.match(token):
+            print("❌ Invalid token format. Should be like: 123456789:ABCdefGHIjklMNOpqrsTUVwxyz")
+            continue
+        
+        return token
 
 def get_telegram_group_id():
     """Get Telegram group ID"""
-    print("\n👥 TELEGRAM GROUP ID")
-    print("-" * 30)
-    print("1. Add your bot to your Telegram group")
-    print("2. Send a message in the group")
-    print("3. Visit: https://api.telegram.org/bot<YOUR_BOT_TOKEN>/getUpdates")
-    print("4. Find your group ID in the response (starts with -100)")
-    print()
-    
-    group_id = get_input("Enter your Telegram group ID")
-    
-    # Basic validation
-    if not group_id.startswith('-100'):
-        print("❌ Invalid group ID format. Should start with -100")
-        return get_telegram_group_id()
-    
-    return group_id
+    while True:
+        print("\n👥 TELEGRAM GROUP ID")
+        print("-" * 30)
+        print("1. Add your bot to your Telegram group")
+        print("2. Send a message in the group")
+        print("3. Visit: https://api.telegram.org/bot<YOUR_BOT_TOKEN>/getUpdates")
+        print("4. Find your group ID in the response (starts with -100)")
+        print()
+        
+        group_id = get_input("Enter your Telegram group ID")
+        
+        # Basic validation
+        if not GROUP_ID_RE.match(group_id):
+            print("❌ Invalid group ID format. Should start with -100")
+            continue
+        
+        return group_id
 
 def get_solana_rpc():
     """Get Solana RPC URL"""
@@ -98,43 +116,44 @@ def get_solana_rpc():
 
 def get_token_mint():
     """Get token mint address"""
-    print("\n🪙 TOKEN MINT ADDRESS")
-    print("-" * 30)
-    print("This is your CR7 token's unique address on Solana.")
-    print("You can find it on Solscan or your token creation transaction.")
-    print()
-    
-    mint = get_input("Enter your CR7 token mint address")
-    
-    # Basic validation
-    if len(mint) < 32:
-        print("❌ Invalid mint address format. Should be a long string.")
-        return get_token_mint()
-    
-    return mint
+    while True:
+        print("\n🪙 TOKEN MINT ADDRESS")
+        print("-" * 30)
+        print("This is your CR7 token's unique address on Solana.")
+        print("You can find it on Solscan or your token creation transaction.")
+        print()
+        
+        mint = get_input("Enter your CR7 token mint address")
+        
+        # Basic validation
+        if not MINT_RE.match(mint):
+            print("❌ Invalid mint address format. Should be a 32-44 character base58 address.")
+            continue
+        
+        return mint
 
 def get_wallet_private_key():
     """Get wallet private key"""
-    print("\n🔐 WALLET PRIVATE KEY")
-    print("-" * 30)
-    print("⚠️  SECURITY WARNING: This will be stored in config.json")
-    print("Make sure to use a dedicated wallet for the bot only!")
-    print()
-    print("How to get your private key:")
-    print("1. Phantom Wallet: Settings → Export Private Key")
-    print("2. Solflare Wallet: Settings → Export Private Key")
-    print("3. Enter your password when prompted")
-    print()
-    
-    private_key = get_input("Enter your private key (long string)")
-    
-    # Convert to array format
-    try:
-        private_key_array = [ord(char) for char in private_key]
-        return private_key_array
-    except Exception as e:
-        print(f"❌ Error converting private key: {e}")
-        return get_wallet_private_key()
+    while True:
+        print("\n🔐 WALLET PRIVATE KEY")
+        print("-" * 30)
+        print("⚠️  SECURITY WARNING: This will be stored in config.json")
+        print("Make sure to use a dedicated wallet for the bot only!")
+        print()
+        print("How to get your private key:")
+        print("1. Phantom Wallet: Settings → Export Private Key")
+        print("2. Solflare Wallet: Settings → Export Private Key")
+        print("3. Enter your password when prompted")
+        print()
+        
+        private_key = get_input("Enter your private key (long string)")
+        
+        # Convert to array format (latin-1 maps each character to its byte value 0-255)
+        try:
+            return list(private_key.encode('latin-1'))
+        except UnicodeEncodeError as e:
+            print(f"❌ Error converting private key: {e}")
+            continue
 
 def get_buy_button_link(token_mint):
     """Get buy button link"""
@@ -193,39 +212,53 @@ def get_monitoring_settings():
     
     return interval, max_tx, delay
 
+def write_private_file(path, data):
+    """Write bytes to a file; a newly created file is readable by the owner only"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+    try:
+        f = os.fdopen(fd, 'wb')
+    except Exception:
+        os.close(fd)
+        raise
+    # Buffered write loops over short writes
+    with f:
+        f.write(data)
+
 def create_env_file(config):
     """Create .env file for sensitive information"""
     try:
-        env_content = f"""# CR7 Token Bot - Environment Variables
-# Keep this file secure and never share it publicly
-
-# Telegram Configuration
-TELEGRAM_BOT_TOKEN={config['TELEGRAM_BOT_TOKEN']}
-TELEGRAM_GROUP_ID={config['TELEGRAM_GROUP_ID']}
-
-# Solana Configuration
-SOLANA_RPC={config['SOLANA_RPC']}
-TOKEN_MINT={config['TOKEN_MINT']}
-
-# Wallet Configuration (PRIVATE KEY - KEEP SECURE!)
-WALLET_PRIVATE_KEY={','.join(map(str, config['WALLET_PRIVATE_KEY']))}
-
-# Token Distribution Settings
-TOKENS_PER_SOL={config['TOKENS_PER_SOL']}
-MINIMUM_BUY_SOL={config['MINIMUM_BUY_SOL']}
-DISTRIBUTION_RATIO={config['DISTRIBUTION_RATIO']}
-MIN_DISTRIBUTION={config['MIN_DISTRIBUTION']}
-MAX_DISTRIBUTION={config['MAX_DISTRIBUTION']}
-AIRDROP_AMOUNT={config['AIRDROP_AMOUNT']}
-
-# Buy Button and Presale
-BUY_BUTTON_LINK={config['BUY_BUTTON_LINK']}
-PRESALE_END_DATE={config['PRESALE_END_DATE']}
-PRESALE_TIMEZONE={config['PRESALE_TIMEZONE']}
-"""
+        # One entry per line of the file; the trailing "" ends it with a newline
+        lines = [
+            "# CR7 Token Bot - Environment Variables",
+            "# Keep this file secure and never share it publicly",
+            "",
+            "# Telegram Configuration",
+            f"TELEGRAM_BOT_TOKEN={config['TELEGRAM_BOT_TOKEN']}",
+            f"TELEGRAM_GROUP_ID={config['TELEGRAM_GROUP_ID']}",
+            "",
+            "# Solana Configuration",
+            f"SOLANA_RPC={config['SOLANA_RPC']}",
+            f"TOKEN_MINT={config['TOKEN_MINT']}",
+            "",
+            "# Wallet Configuration (PRIVATE KEY - KEEP SECURE!)",
+            f"WALLET_PRIVATE_KEY={bytes(config['WALLET_PRIVATE_KEY']).hex()}",
+            "",
+            "# Token Distribution Settings",
+            f"TOKENS_PER_SOL={config['TOKENS_PER_SOL']}",
+            f"MINIMUM_BUY_SOL={config['MINIMUM_BUY_SOL']}",
+            f"DISTRIBUTION_RATIO={config['DISTRIBUTION_RATIO']}",
+            f"MIN_DISTRIBUTION={config['MIN_DISTRIBUTION']}",
+            f"MAX_DISTRIBUTION={config['MAX_DISTRIBUTION']}",
+            f"AIRDROP_AMOUNT={config['AIRDROP_AMOUNT']}",
+            "",
+            "# Buy Button and Presale",
+            f"BUY_BUTTON_LINK={config['BUY_BUTTON_LINK']}",
+            f"PRESALE_END_DATE={config['PRESALE_END_DATE']}",
+            f"PRESALE_TIMEZONE={config['PRESALE_TIMEZONE']}",
+            ""
+        ]
         
-        with open('.env', 'w') as f:
-            f.write(env_content)
+        write_private_file('.env', "\n".join(lines).encode('utf-8'))
         
         print("✅ .env file created successfully!")
         print("⚠️  IMPORTANT: Keep .env file secure and never share it publicly!")
@@ -273,9 +306,17 @@ def create_config():
     
     # Save to files
     try:
-        # Save config.json
-        with open('config.json', 'w') as f:
-            json.dump(config, f, indent=2)
+        # Save config.json (orjson if available, stdlib json otherwise)
+        if orjson:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(config, indent=2).encode()
+        write_private_file('config.json', data)
+        
+        # Compact binary copy for scripts that read the config repeatedly;
+        # config.json stays the file to edit by hand
+        if msgpack:
+            write_private_file('config.msgpack', msgpack.packb(config, use_bin_type=True))
         
         # Create .env file for sensitive information
         create_env_file(config)
@@ -289,7 +330,9 @@ def create_config():
         print("=" * 60)
         print("⚠️  SECURITY REMINDER:")
         print("• Keep .env file secure and never share it publicly")
-        print("• Add .env to .gitignore if using version control")
+        if msgpack:
+            print("• config.msgpack holds the same settings as config.json - keep it private too")
+        print("• Add .env and config.msgpack to .gitignore if using version control")
         print("• The bot will use .env values over config.json values")
         print("=" * 60)
         
@@ -5,6 +5,12 @@ Simple test script to verify CR7 Token Bot works without errors
 
 import sys
 import os
+import ast
+import time
+import asyncio
+import sqlite3
+import tempfile
+from importlib.util import find_spec
 
 def test_imports():
     """Test if all required modules can be imported"""
@@ -48,22 +54,27 @@ def test_imports():
         return False
 
 def test_main_py():
-    """Test if main.py can be imported without errors"""
-    print("\n🔍 Testing main.py import...")
+    """Test if main.py can be found and defines the bot class (without executing it)"""
+    print("\n🔍 Testing main.py...")
     
     try:
         # Add current directory to path
         sys.path.insert(0, os.getcwd())
         
-        # Try to import main module
-        import main
-        print("✅ main.py imported successfully")
+        # Locate the main module without importing it
+        spec = find_spec('main')
+        if spec is None or not spec.origin:
+            print("❌ main.py not found")
+            return False
+        print("✅ main.py found")
         
-        # Check if RealMonitoringBot class exists
-        if hasattr(main, 'RealMonitoringBot'):
-            print("✅ RealMonitoringBot class found")
+        # Check the bot class is defined by parsing the source
+        with open(spec.origin, 'rb') as f:
+            tree = ast.parse(f.read(), filename=spec.origin)
+        if any(isinstance(node, ast.ClassDef) and node.name == 'CR7TokenBot' for node in tree.body):
+            print("✅ CR7TokenBot class found")
         else:
-            print("❌ RealMonitoringBot class not found")
+            print("❌ CR7TokenBot class not found")
             return False
         
         return True
@@ -118,6 +129,66 @@ def test_bot_initialization():
         print(f"❌ Error initializing bot: {e}")
         return False
 
+def test_transfer_record_survives_failed_flush():
+    """Test that a failing state flush can't roll back a concurrent transfer record"""
+    print("\n🔍 Testing transfer record persistence...")
+    
+    try:
+        import main_simple
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            test_config = {
+                "TELEGRAM_BOT_TOKEN": "test_token",
+                "TELEGRAM_GROUP_ID": "test_group",
+                "SOLANA_RPC": "https://api.mainnet-beta.solana.com",
+                "TOKEN_MINT": "test_mint",
+                "STATE_DB_PATH": os.path.join(tmp, "state.db")
+            }
+            
+            original_load_config = main_simple.CR7TokenBot.load_config
+            main_simple.CR7TokenBot.load_config = lambda self, path: test_config
+            try:
+                bot = main_simple.CR7TokenBot()
+            finally:
+                main_simple.CR7TokenBot.load_config = original_load_config
+            
+            def failing_write_state(seen, airdrop_users):
+                # Leave rows uncommitted for a while, then fail the batch
+                with bot._state_db:
+                    bot._state_db.executemany("INSERT OR IGNORE INTO seen (sig) VALUES (?)", seen)
+                    time.sleep(0.3)
+                    raise sqlite3.OperationalError("simulated write failure")
+            
+            async def run():
+                bot._write_state = failing_write_state
+                bot.mark_seen("test_seen_sig")
+                flush = asyncio.create_task(bot.flush_state())
+                await asyncio.sleep(0.05)
+                await bot.record_transfer("test_buy_sig", "purchase", 7000)
+                await flush
+                bot._pending_seen.clear()
+                await bot.aclose()
+            
+            asyncio.run(run())
+            
+            con = sqlite3.connect(test_config["STATE_DB_PATH"])
+            try:
+                transfers = con.execute("SELECT COUNT(*) FROM transfers WHERE signature = 'test_buy_sig'").fetchone()[0]
+                seen = con.execute("SELECT COUNT(*) FROM seen WHERE sig = 'test_seen_sig'").fetchone()[0]
+            finally:
+                con.close()
+        
+        if transfers == 1 and seen == 0:
+            print("✅ Transfer record committed despite a failing flush")
+            return True
+        
+        print(f"❌ Transfer rows: {transfers}, rows from the failed flush: {seen}")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Error testing transfer record persistence: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 CR7 Token Bot - Deployment Test")
@@ -126,7 +197,8 @@ def main():
     tests = [
         test_imports,
         test_main_py,
-        test_bot_initialization
+        test_bot_initialization,
+        test_transfer_record_survives_failed_flush
     ]
     
     all_passed = True
@@ -6,6 +6,27 @@ Test script to verify .env configuration is working
 import os
 from dotenv import load_dotenv
 
+# Key environment variables to check
+ENV_VARS = (
+    'TELEGRAM_BOT_TOKEN',
+    'TELEGRAM_GROUP_ID',
+    'SOLANA_RPC',
+    'TOKEN_MINT',
+    'WALLET_PRIVATE_KEY',
+    'TOKENS_PER_SOL',
+    'MINIMUM_BUY_SOL',
+    'DISTRIBUTION_RATIO',
+    'MIN_DISTRIBUTION',
+    'MAX_DISTRIBUTION',
+    'AIRDROP_AMOUNT',
+    'BUY_BUTTON_LINK',
+    'PRESALE_END_DATE',
+    'PRESALE_TIMEZONE'
+)
+
+# Variables holding secrets, masked in the output
+SENSITIVE_VARS = frozenset({'TELEGRAM_BOT_TOKEN', 'WALLET_PRIVATE_KEY'})
+
 def test_env_config():
     """Test if .env file is loaded correctly"""
     print("🔍 Testing .env configuration...")
@@ -14,32 +35,17 @@ def test_env_config():
     # Load environment variables
     load_dotenv()
     
-    # Test key environment variables
-    env_vars = [
-        'TELEGRAM_BOT_TOKEN',
-        'TELEGRAM_GROUP_ID', 
-        'SOLANA_RPC',
-        'TOKEN_MINT',
-        'WALLET_PRIVATE_KEY',
-        'TOKENS_PER_SOL',
-        'MINIMUM_BUY_SOL',
-        'DISTRIBUTION_RATIO',
-        'MIN_DISTRIBUTION',
-        'MAX_DISTRIBUTION',
-        'AIRDROP_AMOUNT',
-        'BUY_BUTTON_LINK',
-        'PRESALE_END_DATE',
-        'PRESALE_TIMEZONE'
-    ]
+    # Snapshot the environment once instead of going through os.getenv per variable
+    env = dict(os.environ)
     
     print("📋 Environment Variables Status:")
     print("-" * 30)
     
-    for var in env_vars:
-        value = os.getenv(var)
+    for var in ENV_VARS:
+        value = env.get(var)
         if value:
             # Mask sensitive information
-            if 'TOKEN' in var or 'KEY' in var:
+            if var in SENSITIVE_VARS:
                 masked_value = value[:10] + "..." + value[-5:] if len(value) > 15 else "***"
                 print(f"✅ {var}: {masked_value}")
             else:
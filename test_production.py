@@ -8,11 +8,26 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import asyncio
 import logging
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,28 +35,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@functools.cache
+def ensure_env():
+    """Load .env into the environment once per process (existing variables win)"""
+    load_dotenv(override=False)
+
+# Parsed config files by path, with the (source, mtime_ns, size) they were parsed from
+_config_cache = {}
+
+def load_config_file(path, allow_packed=True):
+    """Parse a JSON config file, reusing the previous result if the file is unchanged.
+    
+    A .msgpack copy written next to it by setup_config.py is decoded instead
+    while it is at least as new as the JSON (i.e. the JSON hasn't been hand-edited since).
+    Pass allow_packed=False to validate the JSON itself - it is the file the bots load.
+    """
+    source, st = path, os.stat(path)
+    if msgpack and allow_packed:
+        packed = os.path.splitext(path)[0] + '.msgpack'
+        try:
+            packed_st = os.stat(packed)
+        except FileNotFoundError:
+            pass
+        else:
+            if packed_st.st_mtime_ns >= st.st_mtime_ns:
+                source, st = packed, packed_st
+    
+    key = (source, st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    with open(source, 'rb') as f:
+        data = f.read()
+    if source != path:
+        config = msgpack.unpackb(data, raw=False)
+    else:
+        config = orjson.loads(data) if orjson else json.loads(data)
+    _config_cache[path] = (key, config)
+    return config
+
 class ProductionTester:
     def __init__(self):
         """Initialize the production tester"""
-        load_dotenv()
+        ensure_env()
         self.errors = []
         self.warnings = []
         self.passed = []
+        self._lock = threading.Lock()  # network checks report from worker threads
+        
+        # One HTTP session for all endpoint checks so connections are kept alive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    @functools.cached_property
+    def bot(self):
+        """Telegram Bot client, created on first use; only used inside _run_telegram_probes"""
+        from telegram import Bot
+        return Bot(token=os.getenv('TELEGRAM_BOT_TOKEN'))
+    
+    def close(self):
+        """Release the HTTP session"""
+        self.session.close()
     
     def log_error(self, message):
         """Log an error"""
-        self.errors.append(message)
-        logger.error(f"❌ {message}")
+        with self._lock:
+            self.errors.append(message)
+        logger.error("❌ %s", message)
     
     def log_warning(self, message):
         """Log a warning"""
-        self.warnings.append(message)
-        logger.warning(f"⚠️  {message}")
+        with self._lock:
+            self.warnings.append(message)
+        logger.warning("⚠️  %s", message)
     
     def log_success(self, message):
         """Log a success"""
-        self.passed.append(message)
-        logger.info(f"✅ {message}")
+        with self._lock:
+            self.passed.append(message)
+        logger.info("✅ %s", message)
     
     def test_environment_variables(self):
         """Test environment variables"""
@@ -54,9 +129,12 @@ class ProductionTester:
             'SOLANA_RPC': 'Solana RPC URL'
         }
         
+        # Snapshot the environment once instead of going through os.getenv per variable
+        env = dict(os.environ)
+        
         for var, description in required_vars.items():
-            value = os.getenv(var)
-            if not value or value.startswith('your_') or value == '':
+            value = env.get(var)
+            if not value or value.startswith('your_'):
                 self.log_error(f"Missing or invalid {description}: {var}")
             else:
                 self.log_success(f"{description} is configured: {var}")
@@ -69,7 +147,7 @@ class ProductionTester:
         }
         
         for var, default in optional_vars.items():
-            value = os.getenv(var, default)
+            value = env.get(var, default)
             try:
                 if var in ['TOKENS_PER_SOL', 'AIRDROP_AMOUNT']:
                     int(value)
@@ -88,8 +166,8 @@ class ProductionTester:
             return
         
         try:
-            with open('config.json', 'r') as f:
-                config = json.load(f)
+            # Parse config.json itself, never the msgpack copy: it is what the bots load
+            config = load_config_file('config.json', allow_packed=False)
             
             # Check for sensitive data
             sensitive_keys = ['TELEGRAM_BOT_TOKEN', 'WALLET_PRIVATE_KEY']
@@ -111,25 +189,20 @@ class ProductionTester:
         """Test Python dependencies"""
         logger.info("🔍 Testing Python dependencies...")
         
-        required_packages = [
+        required_packages = (
             'requests',
             'telegram',
             'dotenv',
-            'pytz',
+            'tzdata',
             'aiohttp'
-        ]
+        )
         
         for package in required_packages:
-            try:
-                if package == 'telegram':
-                    import telegram
-                elif package == 'dotenv':
-                    import dotenv
-                else:
-                    __import__(package)
+            # find_spec only locates the module; nothing is imported or executed
+            if find_spec(package) is not None:
                 self.log_success(f"Package {package} is available")
-            except ImportError as e:
-                self.log_error(f"Package {package} not available: {e}")
+            else:
+                self.log_error(f"Package {package} not available")
     
     def test_telegram_connection(self):
         """Test Telegram bot connection"""
@@ -141,20 +214,20 @@ class ProductionTester:
             return
         
         try:
-            from telegram import Bot
-            bot = Bot(token=token)
-            
             # Test bot info
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            bot_info = loop.run_until_complete(bot.get_me())
-            loop.close()
+            bot_info = asyncio.run(self._run_telegram_probes())
             
             self.log_success(f"Telegram bot connected: @{bot_info.username}")
             
         except Exception as e:
             self.log_error(f"Failed to connect to Telegram: {e}")
     
+    async def _run_telegram_probes(self):
+        """Run every Telegram API call in one event loop, so the cached Bot is
+        initialised, used and shut down on the same loop"""
+        async with self.bot as bot:
+            return await bot.get_me()
+    
     def test_solana_rpc(self):
         """Test Solana RPC connection"""
         logger.info("🔍 Testing Solana RPC connection...")
@@ -168,7 +241,7 @@ class ProductionTester:
                 "method": "getHealth"
             }
             
-            response = requests.post(rpc_url, json=payload, timeout=10)
+            response = self.session.post(rpc_url, json=payload, timeout=10)
             
             if response.status_code == 200:
                 self.log_success(f"Solana RPC is accessible: {rpc_url}")
@@ -186,7 +259,7 @@ class ProductionTester:
         
         # Test health endpoint
         try:
-            response = requests.get(f"{base_url}/health", timeout=5)
+            response = self.session.get(f"{base_url}/health", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 self.log_success(f"Health endpoint working: {data.get('status')}")
@@ -199,7 +272,7 @@ class ProductionTester:
         
         # Test metrics endpoint
         try:
-            response = requests.get(f"{base_url}/metrics", timeout=5)
+            response = self.session.get(f"{base_url}/metrics", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 self.log_success("Metrics endpoint working")
@@ -222,40 +295,58 @@ class ProductionTester:
             'config.json'
         ]
         
+        # One directory listing instead of a stat() per file
+        with os.scandir('.') as it:
+            entries = {entry.name: entry for entry in it}
+        
         for file in required_files:
-            if os.path.exists(file):
+            if file in entries:
                 self.log_success(f"Required file exists: {file}")
             else:
                 self.log_error(f"Required file missing: {file}")
         
         # Check for logs directory
-        if os.path.exists('logs'):
+        logs = entries.get('logs')
+        if logs is not None and logs.is_dir():
             self.log_success("Logs directory exists")
         else:
             self.log_warning("Logs directory not found (will be created on startup)")
     
+    def _safe_run(self, test):
+        """Run a single test, recording any unexpected exception as an error"""
+        try:
+            test()
+        except Exception as e:
+            self.log_error(f"Test {test.__name__} failed with exception: {e}")
+    
     def run_all_tests(self):
         """Run all production tests"""
         logger.info("🚀 Starting CR7 Token Bot Production Tests")
         logger.info("=" * 50)
         
-        tests = [
+        # Quick local checks run in order; the network-bound checks are
+        # independent, so their waits overlap in a thread pool
+        local_tests = [
             self.test_file_structure,
             self.test_dependencies,
             self.test_config_file,
-            self.test_environment_variables,
+            self.test_environment_variables
+        ]
+        network_tests = [
             self.test_telegram_connection,
             self.test_solana_rpc,
             self.test_web_server
         ]
         
-        for test in tests:
-            try:
-                test()
-            except Exception as e:
-                self.log_error(f"Test {test.__name__} failed with exception: {e}")
+        for test in local_tests:
+            self._safe_run(test)
             logger.info("")
         
+        # Worker threads only log their own results; the spacer comes from here
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(self._safe_run, network_tests))
+        logger.info("")
+        
         # Print summary
         logger.info("=" * 50)
         logger.info("📊 TEST SUMMARY")
@@ -285,7 +376,10 @@ class ProductionTester:
 def main():
     """Main entry point"""
     tester = ProductionTester()
-    success = tester.run_all_tests()
+    try:
+        success = tester.run_all_tests()
+    finally:
+        tester.close()
     return 0 if success else 1
 
 if __name__ == "__main__":